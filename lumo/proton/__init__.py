@@ -2,4 +2,8 @@ from ._primitives import *
 from ._strings import *
 from ._collections import *
 from ._generics import *
+from ._schema import *
+from ._compression import *
+from ._gather import *
+from ._shared import *
 from ._proton import *
@@ -1,5 +1,5 @@
 from typing import Optional, Iterable, BinaryIO
-from typing import TypeVar
+from typing import Tuple, TypeVar
 from abc import abstractmethod
 
 from lumo.codecs import *
@@ -13,6 +13,13 @@ __all__ = 'MultipartEncoder', 'MultipartDecoder', \
 _T = TypeVar('_T')
 
 
+def _describe(codec: Codec, path: Tuple[Codec, ...] = ()) -> str:
+    schema = getattr(codec, '_schema', None)
+    if schema is None:
+        return type(codec).__qualname__
+    return schema(path)
+
+
 #
 
 
@@ -59,6 +66,7 @@ class MultipartDecoder(Decoder[_T]):
             self.__decoders = None
         self.__current = None
         self.__state = 0
+        self.__stack = None
 
     def __next(self):
         if self.__state == 2:
@@ -76,6 +84,28 @@ class MultipartDecoder(Decoder[_T]):
 
         return self.__current
 
+    def __step(self) -> Optional[Decoder]:
+        self.__current = self.__next()
+        return self.__current
+
+    def __leaf(self) -> Optional[Decoder]:
+        stack = self.__stack
+        if stack is None:
+            stack = self.__stack = [self]
+        while stack:
+            frame = stack[-1]
+            if isinstance(frame, MultipartDecoder):
+                child = frame.__step()
+                if child is None:
+                    stack.pop()
+                else:
+                    stack.append(child)
+            elif frame.has_remaining():
+                return frame
+            else:
+                stack.pop()
+        return None
+
     def _next(self, current: Optional[Decoder]) -> Optional[Decoder]:
         try:
             return next(self.__decoders)
@@ -89,25 +119,19 @@ class MultipartDecoder(Decoder[_T]):
     def get(self) -> _T: ...
 
     def decode(self, stream: BinaryIO) -> int:
-        while self.__state != 2:
-            if self.__current is not None and self.__current.has_remaining():
-                return self.__current.decode(stream)
-            self.__current = self.__next()
-        return 0
+        leaf = self.__leaf()
+        if leaf is None:
+            return 0
+        return leaf.decode(stream)
 
     def remaining(self) -> int:
-        while self.__state != 2:
-            if self.__current is not None and self.__current.has_remaining():
-                return self.__current.remaining()
-            self.__current = self.__next()
-        return 0
+        leaf = self.__leaf()
+        if leaf is None:
+            return 0
+        return leaf.remaining()
 
     def has_remaining(self) -> bool:
-        while self.__state != 2:
-            if self.__current is not None and self.__current.has_remaining():
-                return True
-            self.__current = self.__next()
-        return False
+        return self.__leaf() is not None
 
 
 #
@@ -121,7 +145,10 @@ class RawEncoder(Encoder[_T]):
     def encode(self, stream: BinaryIO) -> int:
         if self.__pos >= len(self.__data):
             return 0
-        n = stream.write(self.__data[self.__pos:])
+        data = self.__data
+        if self.__pos:
+            data = memoryview(data)[self.__pos:]
+        n = stream.write(data)
         if n > 0:
             self.__pos += n
         return n
@@ -165,20 +192,24 @@ class RawDecoder(Decoder[_T]):
 #
 
 
+def _varint(value: int) -> bytearray:
+    if value < 0:
+        raise ValueError()
+    data = bytearray()
+    while True:
+        octet = value & 0x7F
+        value = value >> 7
+        if value:
+            octet = octet | 0x80
+        data.append(octet)
+        if not value:
+            break
+    return data
+
+
 class VarintEncoder(RawEncoder[_T]):
     def __init__(self, value: int):
-        if value < 0:
-            raise ValueError()
-        data = bytearray()
-        while True:
-            octet = value & 0x7F
-            value = value >> 7
-            if value:
-                octet = octet | 0x80
-            data.append(octet)
-            if not value:
-                break
-        super().__init__(data)
+        super().__init__(_varint(value))
 
 
 class VarintDecoder(Decoder[_T]):
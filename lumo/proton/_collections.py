@@ -1,12 +1,18 @@
 import typing
-from typing import Callable, Iterator, Optional
+from struct import pack, unpack
+from typing import Any, BinaryIO, Callable, Iterator, Optional, Sequence
 from typing import TypeVar
 
 from lumo.codecs import *
+from lumo.types import Serializable
 from ._basic import *
-from ._generics import Tuple
+from ._basic import _describe, _varint
+from ._generics import Object
+from ._primitives import Integer, Float, Boolean
+from ._primitives import _zigzag, _unzigzag
+from ._strings import String
 
-__all__ = 'Collection', 'Dict',
+__all__ = 'Collection', 'Dict', 'Columnar', 'Columns',
 
 #
 
@@ -73,6 +79,9 @@ class Collection(Codec[_Collection]):
     def decoder(self) -> Decoder[_Collection]:
         return CollectionDecoder(self.__ctor, self.__codec)
 
+    def _schema(self, path: tuple) -> str:
+        return f'seq({_describe(self.__codec, path)})'
+
 
 #
 
@@ -80,26 +89,302 @@ _K = TypeVar('_K')
 _V = TypeVar('_V')
 
 
-class DictEncoder(CollectionEncoder[typing.Dict[_K, _V]]):
+def _pack_string(value: str) -> bytes:
+    value = value.encode('utf-8')
+    return _varint(len(value)) + value
+
+
+def _pack_integer(value: int) -> bytes:
+    return _varint(_zigzag(value))
+
+
+def _packer(codec: Codec) -> Optional[Callable[[Any], bytes]]:
+    if isinstance(codec, Integer):
+        return _pack_integer
+    if isinstance(codec, String):
+        cache = codec.cache
+        return cache.get if cache is not None else _pack_string
+    return None
+
+
+class DictEncoder(MultipartEncoder[typing.Dict[_K, _V]]):
     def __init__(self, value: typing.Dict[_K, _V], key_codec: Codec[_K], value_codec: Codec[_V]):
-        items = list(value.items())
-        codec = Tuple((key_codec, value_codec))
-        super().__init__(items, codec)
+        super().__init__(self.__encoders(value, key_codec, value_codec))
 
+    @staticmethod
+    def __encoders(value: typing.Dict[_K, _V], key_codec: Codec[_K], value_codec: Codec[_V]) -> Iterator[Encoder]:
+        yield VarintEncoder(len(value))
+        for key, item in value.items():
+            yield key_codec.encoder(key)
+            yield value_codec.encoder(item)
 
-class DictDecoder(CollectionDecoder[typing.Dict[_K, _V]]):
+
+class DictDecoder(MultipartDecoder[typing.Dict[_K, _V]]):
     def __init__(self, key_codec: Codec[_K], value_codec: Codec[_V]):
-        codec = Tuple((key_codec, value_codec))
-        super().__init__(dict, codec)
+        self.__key_codec = key_codec
+        self.__value_codec = value_codec
+        self.__items = {}
+        self.__size = None
+        self.__count = 0
+        self.__key = None
+        self.__keyed = False
+        super().__init__()
+
+    def _next(self, current: Optional[Decoder]) -> Optional[Decoder]:
+        if current is None:
+            return VarintDecoder()
+
+        if self.__size is None:
+            self.__size = current.get()
+        elif not self.__keyed:
+            self.__key = current.get()
+            self.__keyed = True
+            return self.__value_codec.decoder()
+        else:
+            self.__items[self.__key] = current.get()
+            self.__keyed = False
+            self.__count += 1
+
+        if self.__count >= self.__size:
+            return None
+        return self.__key_codec.decoder()
+
+    def get(self) -> typing.Dict[_K, _V]:
+        if self.__size is None or self.__count < self.__size:
+            raise ValueError()
+        return self.__items
+
+
+class ScalarDictDecoder(Decoder[typing.Dict[_K, _V]]):
+    def __init__(self, key_string: bool, value_string: bool):
+        self.__strings = (key_string, value_string)
+        self.__items = {}
+        self.__size = None
+        self.__count = 0
+        self.__key = None
+        self.__slot = 0
+        self.__varint = 0
+        self.__offset = 0
+        self.__length = None
+        self.__data = bytearray()
+        self.__done = False
+
+    def __put(self, value):
+        if self.__slot == 0:
+            self.__key = value
+            self.__slot = 1
+            return
+        self.__items[self.__key] = value
+        self.__slot = 0
+        self.__count += 1
+        if self.__count >= self.__size:
+            self.__done = True
+
+    def get(self) -> typing.Dict[_K, _V]:
+        if not self.__done:
+            raise ValueError()
+        return self.__items
+
+    def decode(self, stream: BinaryIO) -> int:
+        total = 0
+        while not self.__done:
+            if self.__length is not None:
+                data = stream.read(self.__length - len(self.__data))
+                if not data:
+                    break
+                total += len(data)
+                self.__data += data
+                if len(self.__data) < self.__length:
+                    continue
+                value = self.__data.decode('utf-8')
+                self.__data.clear()
+                self.__length = None
+                self.__put(value)
+                continue
+
+            data = stream.read(1)
+            if not data:
+                break
+            total += 1
+            octet, = data
+            self.__varint |= (octet & 0x7F) << self.__offset
+            self.__offset += 7
+            if octet & 0x80:
+                continue
+            value = self.__varint
+            self.__varint = 0
+            self.__offset = 0
+
+            if self.__size is None:
+                self.__size = value
+                self.__done = not value
+            elif not self.__strings[self.__slot]:
+                self.__put(_unzigzag(value))
+            elif value:
+                self.__length = value
+            else:
+                self.__put('')
+        return total
+
+    def remaining(self) -> int:
+        if self.__done:
+            return 0
+        if self.__length is not None:
+            return self.__length - len(self.__data)
+        return 1
 
 
 class Dict(Codec[typing.Dict[_K, _V]]):
     def __init__(self, key: Codec[_K], value: Codec[_V]):
         self.__key = key
         self.__value = value
+        self.__key_packer = _packer(key)
+        self.__value_packer = _packer(value)
 
     def encoder(self, value: typing.Dict[_K, _V]) -> Encoder[typing.Dict[_K, _V]]:
-        return DictEncoder(value, self.__key, self.__value)
+        if self.__key_packer is None or self.__value_packer is None:
+            return DictEncoder(value, self.__key, self.__value)
+        pack_key = self.__key_packer
+        pack_value = self.__value_packer
+        data = _varint(len(value))
+        for key, item in value.items():
+            data += pack_key(key)
+            data += pack_value(item)
+        return RawEncoder(data)
 
     def decoder(self) -> Decoder[typing.Dict[_K, _V]]:
-        return DictDecoder(self.__key, self.__value)
+        if self.__key_packer is None or self.__value_packer is None:
+            return DictDecoder(self.__key, self.__value)
+        return ScalarDictDecoder(isinstance(self.__key, String), isinstance(self.__value, String))
+
+    def _schema(self, path: tuple) -> str:
+        return f'map({_describe(self.__key, path)},{_describe(self.__value, path)})'
+
+
+#
+
+_T = TypeVar('_T')
+_Serializable = TypeVar('_Serializable', bound=Serializable)
+
+
+class Columnar(typing.List[_T]):
+    pass
+
+
+def _pack_column(codec: Codec, values: Sequence) -> Optional[bytes]:
+    if isinstance(codec, Float):
+        return pack(f'>{len(values)}f', *values)
+    if isinstance(codec, Boolean):
+        return bytes(1 if value else 0 for value in values)
+    packer = _packer(codec)
+    if packer is not None:
+        return b''.join(map(packer, values))
+    return None
+
+
+def _column_width(codec: Codec) -> int:
+    if isinstance(codec, Float):
+        return 4
+    if isinstance(codec, Boolean):
+        return 1
+    return 0
+
+
+def _unpack_column(codec: Codec, data: bytes, size: int) -> list:
+    if isinstance(codec, Float):
+        return list(unpack(f'>{size}f', data))
+    values = []
+    for value in data:
+        if value > 1:
+            msg = f'Invalid boolean value 0x{value:02x}'
+            raise DecoderException(msg)
+        values.append(value == 1)
+    return values
+
+
+class ColumnsEncoder(MultipartEncoder[typing.List[_Serializable]]):
+    def __init__(self, values: Sequence[_Serializable], codec: Object[_Serializable]):
+        type = codec.type
+        for value in values:
+            if not isinstance(value, type):
+                raise ValueError()
+        rows = [codec.dump(value) for value in values]
+        super().__init__(self.__encoders(rows, tuple(codec.codecs.values())))
+
+    @staticmethod
+    def __encoders(rows: typing.List[tuple], codecs: Sequence[Codec]) -> Iterator[Encoder]:
+        yield VarintEncoder(len(rows))
+        for index, codec in enumerate(codecs):
+            column = [row[index] for row in rows]
+            data = _pack_column(codec, column)
+            if data is not None:
+                yield RawEncoder(data)
+            else:
+                for value in column:
+                    yield codec.encoder(value)
+
+
+class ColumnsDecoder(MultipartDecoder[typing.List[_Serializable]]):
+    def __init__(self, codec: Object[_Serializable], records: bool):
+        self.__object = codec
+        self.__fields = iter(codec.codecs.items())
+        self.__records = records
+        self.__columns: typing.Dict[str, list] = {}
+        self.__size = None
+        self.__key = None
+        self.__codec = None
+        self.__bulk = False
+        self.__value = None
+        super().__init__()
+
+    def _next(self, current: Optional[Decoder]) -> Optional[Decoder]:
+        if current is None:
+            return VarintDecoder()
+
+        if self.__size is None:
+            self.__size = current.get()
+        elif self.__bulk:
+            self.__columns[self.__key] = _unpack_column(self.__codec, current.get(), self.__size)
+        else:
+            self.__columns[self.__key].append(current.get())
+
+        while True:
+            if self.__key is not None and len(self.__columns[self.__key]) < self.__size:
+                return self.__codec.decoder()
+            try:
+                self.__key, self.__codec = next(self.__fields)
+            except StopIteration:
+                return None
+            self.__columns[self.__key] = []
+            width = _column_width(self.__codec)
+            self.__bulk = bool(width and self.__size)
+            if self.__bulk:
+                return RawDecoder(width * self.__size)
+
+    def _flush(self):
+        if not self.__records:
+            self.__value = self.__columns
+            return
+        load = self.__object.load
+        rows = zip(*self.__columns.values()) if self.__columns else ((),) * self.__size
+        self.__value = [load(row) for row in rows]
+
+    def get(self) -> typing.Union[typing.List[_Serializable], typing.Dict[str, list]]:
+        if self.__value is None:
+            raise ValueError()
+        return self.__value
+
+
+class Columns(Codec[typing.List[_Serializable]]):
+    def __init__(self, codec: Object[_Serializable], records: bool = True):
+        self.__codec = codec
+        self.__records = records
+
+    def encoder(self, values: Sequence[_Serializable]) -> Encoder[typing.List[_Serializable]]:
+        return ColumnsEncoder(values, self.__codec)
+
+    def decoder(self) -> Decoder[typing.List[_Serializable]]:
+        return ColumnsDecoder(self.__codec, self.__records)
+
+    def _schema(self, path: tuple) -> str:
+        return f'columns({_describe(self.__codec, path)})'
@@ -0,0 +1,250 @@
+import bz2
+import lzma
+import typing
+import zlib
+from io import BytesIO
+from typing import Any, BinaryIO, Callable, Optional, Sequence
+
+from lumo.codecs import *
+from ._basic import *
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        import pyzstd as zstd
+    except ImportError:
+        zstd = None
+
+__all__ = 'Compressed', 'compressions',
+
+#
+
+
+class _Identity:
+    needs_input = True
+    eof = False
+    unused_data = bytes()
+
+    def decompress(self, data: bytes, max_length: int = -1) -> bytes:
+        return data
+
+
+class _Zlib:
+    def __init__(self):
+        self.__decompressor = zlib.decompressobj()
+        self.__tail = bytes()
+        self.needs_input = True
+
+    @property
+    def eof(self) -> bool:
+        return self.__decompressor.eof
+
+    @property
+    def unused_data(self) -> bytes:
+        return self.__decompressor.unused_data
+
+    def decompress(self, data: bytes, max_length: int = -1) -> bytes:
+        if self.__tail:
+            data = self.__tail + data
+        data = self.__decompressor.decompress(data, max(max_length, 0))
+        self.__tail = self.__decompressor.unconsumed_tail
+        self.needs_input = not self.__tail and (max_length < 0 or len(data) < max_length)
+        return data
+
+
+class _BufferReader:
+    def __init__(self, buffer: bytearray):
+        self.__buffer = buffer
+        self.__pos = 0
+
+    def read(self, size: int = -1) -> bytearray:
+        start = self.__pos
+        end = len(self.__buffer) if size < 0 else min(start + size, len(self.__buffer))
+        self.__pos = end
+        return self.__buffer[start:end]
+
+    def tell(self) -> int:
+        return self.__pos
+
+
+class _Compression(typing.NamedTuple):
+    id: int
+    compress: Callable[[bytes, Optional[int]], bytes]
+    decompressor: Callable[[], Any]
+
+
+_COMPRESSIONS: typing.Dict[str, _Compression] = {
+    'none': _Compression(
+        0,
+        lambda data, level: data,
+        _Identity,
+    ),
+    'zlib': _Compression(
+        1,
+        lambda data, level: zlib.compress(data, -1 if level is None else level),
+        _Zlib,
+    ),
+    'lzma': _Compression(
+        2,
+        lambda data, level: lzma.compress(data, preset=level),
+        lzma.LZMADecompressor,
+    ),
+    'bz2': _Compression(
+        3,
+        lambda data, level: bz2.compress(data, 9 if level is None else level),
+        bz2.BZ2Decompressor,
+    ),
+}
+
+if lz4 is not None:
+    _COMPRESSIONS['lz4'] = _Compression(
+        4,
+        lambda data, level: lz4.frame.compress(data, compression_level=level or 0),
+        lz4.frame.LZ4FrameDecompressor,
+    )
+
+if zstd is not None:
+    _COMPRESSIONS['zstd'] = _Compression(
+        5,
+        lambda data, level: zstd.compress(data, level),
+        zstd.ZstdDecompressor,
+    )
+
+_DECOMPRESSORS = {compression.id: compression.decompressor for compression in _COMPRESSIONS.values()}
+
+_CHUNK_SIZE = 1 << 16
+
+
+def compressions() -> typing.Tuple[str, ...]:
+    return tuple(_COMPRESSIONS)
+
+
+#
+
+
+class CompressedEncoder(MultipartEncoder[list]):
+    def __init__(self, values: Sequence, codec: Codec, compression: _Compression, level: Optional[int]):
+        buffer = BytesIO()
+        for value in values:
+            encoder = codec.encoder(value)
+            while encoder.has_remaining():
+                encoder.encode(buffer)
+        data = compression.compress(buffer.getvalue(), level)
+        super().__init__((
+            VarintEncoder(compression.id),
+            VarintEncoder(len(values)),
+            VarintEncoder(len(data)),
+            RawEncoder(data),
+        ))
+
+
+class CompressedDecoder(Decoder[list]):
+    def __init__(self, codec: Codec):
+        self.__codec = codec
+        self.__header = [VarintDecoder(), VarintDecoder(), VarintDecoder()]
+        self.__decompressor = None
+        self.__size = None
+        self.__length = None
+        self.__buffer = bytearray()
+        self.__decoder = None
+        self.__items = []
+
+    def __start(self):
+        id, size, length = (decoder.get() for decoder in self.__header)
+        if id not in _DECOMPRESSORS:
+            msg = f'Unsupported compression {id}'
+            raise DecoderException(msg)
+        self.__decompressor = _DECOMPRESSORS[id]()
+        self.__size = size
+        self.__length = length
+        if not length:
+            self.__finish()
+
+    def __feed(self, data: bytes):
+        if not data:
+            return
+        buffer = self.__buffer
+        buffer += data
+        stream = _BufferReader(buffer)
+        while len(self.__items) < self.__size:
+            if self.__decoder is None:
+                self.__decoder = self.__codec.decoder()
+            decoder = self.__decoder
+            while decoder.has_remaining():
+                position = stream.tell()
+                decoder.decode(stream)
+                if stream.tell() == position:
+                    break
+            if decoder.has_remaining():
+                break
+            self.__items.append(decoder.get())
+            self.__decoder = None
+        del buffer[:stream.tell()]
+        if buffer and len(self.__items) >= self.__size:
+            raise DecoderException('Trailing data in compressed block')
+
+    def __finish(self):
+        if not isinstance(self.__decompressor, _Identity) and not self.__decompressor.eof:
+            raise DecoderException('Truncated compressed block')
+        if len(self.__items) < self.__size:
+            raise DecoderException('Truncated compressed block')
+
+    def get(self) -> list:
+        if self.has_remaining():
+            raise ValueError()
+        return self.__items
+
+    def decode(self, stream: BinaryIO) -> int:
+        for decoder in self.__header:
+            if decoder.has_remaining():
+                n = decoder.decode(stream)
+                if decoder is self.__header[-1] and not decoder.has_remaining():
+                    self.__start()
+                return n
+
+        if not self.__length:
+            return 0
+
+        data = stream.read(min(self.__length, _CHUNK_SIZE))
+        if not data:
+            return 0
+
+        self.__length -= len(data)
+        decompressor = self.__decompressor
+        if decompressor.eof:
+            raise DecoderException('Trailing data in compressed block')
+        self.__feed(decompressor.decompress(data, _CHUNK_SIZE))
+        while not decompressor.needs_input and not decompressor.eof:
+            self.__feed(decompressor.decompress(bytes(), _CHUNK_SIZE))
+        if decompressor.unused_data:
+            raise DecoderException('Trailing data in compressed block')
+        if not self.__length:
+            self.__finish()
+        return len(data)
+
+    def remaining(self) -> int:
+        for decoder in self.__header:
+            if decoder.has_remaining():
+                return decoder.remaining()
+        return self.__length
+
+
+class Compressed(Codec[list]):
+    def __init__(self, codec: Codec, compression: str = 'zlib', level: Optional[int] = None):
+        if compression not in _COMPRESSIONS:
+            raise ValueError(f'Unsupported compression {compression}')
+        self.__codec = codec
+        self.__compression = _COMPRESSIONS[compression]
+        self.__level = level
+
+    def encoder(self, values: Sequence) -> Encoder[list]:
+        return CompressedEncoder(values, self.__codec, self.__compression, self.__level)
+
+    def decoder(self) -> Decoder[list]:
+        return CompressedDecoder(self.__codec)
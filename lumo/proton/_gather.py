@@ -0,0 +1,106 @@
+import os
+import socket
+from typing import List, Union
+
+from lumo.codecs import *
+
+__all__ = 'GatherBuffer',
+
+#
+
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
+_Buffer = Union[bytes, bytearray, memoryview]
+
+
+class GatherBuffer:
+    def __init__(self, threshold: int = 1024):
+        if threshold <= 0:
+            raise ValueError()
+        self.__threshold = threshold
+        self.__segments: List[_Buffer] = []
+        self.__tail = bytearray()
+        self.__size = 0
+
+    def __seal(self):
+        if self.__tail:
+            self.__segments.append(self.__tail)
+            self.__tail = bytearray()
+
+    def __advance(self, n: int):
+        self.__size -= n
+        segments = self.__segments
+        index = 0
+        while n:
+            segment = segments[index]
+            if n < len(segment):
+                segments[index] = memoryview(segment)[n:]
+                break
+            n -= len(segment)
+            index += 1
+        del segments[:index]
+
+    def write(self, data: _Buffer) -> int:
+        data = memoryview(data).cast('B')
+        n = len(data)
+        if n >= self.__threshold:
+            self.__seal()
+            self.__segments.append(data)
+        else:
+            self.__tail += data
+        self.__size += n
+        return n
+
+    def encode(self, encoder: Encoder) -> int:
+        size = self.__size
+        while encoder.has_remaining():
+            encoder.encode(self)
+        return self.__size - size
+
+    def segments(self) -> List[_Buffer]:
+        self.__seal()
+        return list(self.__segments)
+
+    def writev(self, fd: int) -> int:
+        self.__seal()
+        total = 0
+        while self.__segments:
+            segments = self.__segments[:_IOV_MAX]
+            try:
+                n = os.writev(fd, segments)
+            except BlockingIOError:
+                break
+            self.__advance(n)
+            total += n
+            if n < sum(len(segment) for segment in segments):
+                break
+        return total
+
+    def sendmsg(self, sock: socket.socket) -> int:
+        self.__seal()
+        total = 0
+        while self.__segments:
+            segments = self.__segments[:_IOV_MAX]
+            try:
+                n = sock.sendmsg(segments)
+            except BlockingIOError:
+                break
+            self.__advance(n)
+            total += n
+            if n < sum(len(segment) for segment in segments):
+                break
+        return total
+
+    def clear(self):
+        self.__segments.clear()
+        self.__tail = bytearray()
+        self.__size = 0
+
+    def has_remaining(self) -> bool:
+        return self.__size > 0
+
+    def __len__(self) -> int:
+        return self.__size
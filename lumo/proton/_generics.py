@@ -1,16 +1,20 @@
+import dataclasses
 import enum
+import hashlib
+import inspect
+import operator
 import typing
-from typing import Any, Sequence, Dict, Type, BinaryIO, Optional
+from typing import Any, Callable, Sequence, Dict, Type, BinaryIO, Optional
 from typing import TypeVar
 
 from lumo.codecs import *
 from lumo.types import Serializable
 from ._basic import *
 
-__all__ = 'Enum', 'Union', 'Tuple', 'Object'
+__all__ = 'Enum', 'Union', 'Tuple', 'Object', 'Projection', 'Delta',
 
 #
-from ._basic import _T
+from ._basic import _T, _describe
 
 _Enum = TypeVar('_Enum', bound=enum.Enum)
 
@@ -41,6 +45,7 @@ class EnumDecoder(VarintDecoder[_Enum]):
 class Enum(Codec[_Enum]):
     def __init__(self, type: Type[_Enum]):
         self.__members = list(type.__members__.values())
+        self.__names = tuple(type.__members__.keys())
 
     def encoder(self, value: _Enum) -> Encoder[_Enum]:
         return EnumEncoder(value, self.__members)
@@ -48,6 +53,9 @@ class Enum(Codec[_Enum]):
     def decoder(self) -> Decoder[_Enum]:
         return EnumDecoder(self.__members)
 
+    def _schema(self, path: tuple) -> str:
+        return f'enum({",".join(self.__names)})'
+
 
 #
 
@@ -113,6 +121,9 @@ class Union(Codec):
     def decoder(self) -> Decoder:
         return UnionDecoder(self.__choices)
 
+    def _schema(self, path: tuple) -> str:
+        return f'union({",".join(_describe(codec, path) for _, codec in self.__choices)})'
+
 
 #
 
@@ -167,6 +178,9 @@ class Tuple(Codec[tuple]):
     def decoder(self) -> Decoder[tuple]:
         return TupleDecoder(self.__codecs)
 
+    def _schema(self, path: tuple) -> str:
+        return f'tuple({",".join(_describe(codec, path) for codec in self.__codecs)})'
+
 
 #
 
@@ -174,13 +188,56 @@ class Tuple(Codec[tuple]):
 _Serializable = TypeVar('_Serializable', bound=Serializable)
 
 
+def _overrides(type: Type[Serializable], name: str) -> bool:
+    for base in type.__mro__:
+        if name in base.__dict__:
+            return base not in Serializable.__mro__
+    return False
+
+
+def _dumper(type: Type[_Serializable], keys: Sequence[str]) -> Callable[[_Serializable], tuple]:
+    if _overrides(type, 'dump'):
+        def dump(value: _Serializable) -> tuple:
+            values = value.dump()
+            return tuple(values[key] for key in keys)
+        return dump
+
+    if not keys:
+        return lambda value: ()
+    getter = operator.attrgetter(*keys)
+    if len(keys) == 1:
+        return lambda value: (getter(value),)
+    return getter
+
+
+def _loader(type: Type[_Serializable], keys: Sequence[str]) -> Callable[[Sequence], _Serializable]:
+    if _overrides(type, 'load'):
+        def load(values: Sequence) -> _Serializable:
+            return type.load(dict(zip(keys, values)))
+        return load
+
+    new = type.__new__
+    assign = object.__setattr__
+
+    def load(values: Sequence) -> _Serializable:
+        value = new(type)
+        for key, item in zip(keys, values):
+            assign(value, key, item)
+        return value
+    return load
+
+
 class ObjectEncoder(MultipartEncoder[_Serializable]):
-    def __init__(self, value: _Serializable, type: Type[_Serializable], codecs: Dict[str, Codec]):
+    def __init__(
+            self,
+            value: _Serializable,
+            type: Type[_Serializable],
+            codecs: Sequence[Codec],
+            dump: Callable[[_Serializable], tuple]
+    ):
         if not isinstance(value, type):
             raise ValueError()
-        values = value.dump()
-        values = tuple((values[key], codec) for key, codec in codecs.items())
-        self.__values = iter(values)
+        self.__values = zip(dump(value), codecs)
         super().__init__()
 
     def _next(self, current: Optional[Encoder]) -> Optional[Encoder]:
@@ -192,18 +249,16 @@ class ObjectEncoder(MultipartEncoder[_Serializable]):
 
 
 class ObjectDecoder(MultipartDecoder[_Serializable]):
-    def __init__(self, type: Type[_Serializable], codecs: Dict[str, Codec]):
-        codecs = dict(codecs)
-        self.__type = type
-        self.__keys = iter(codecs.keys())
-        self.__codecs = iter(codecs.values())
-        self.__items = {}
+    def __init__(self, codecs: Sequence[Codec], load: Callable[[Sequence], _Serializable]):
+        self.__codecs = iter(codecs)
+        self.__load = load
+        self.__items = []
         self.__size = len(codecs)
         super().__init__()
 
     def _next(self, current: Optional[Decoder]) -> Optional[Decoder]:
         if current is not None:
-            self.__items[next(self.__keys)] = current.get()
+            self.__items.append(current.get())
         try:
             codec = next(self.__codecs)
         except StopIteration:
@@ -213,16 +268,212 @@ class ObjectDecoder(MultipartDecoder[_Serializable]):
     def get(self) -> _Serializable:
         if len(self.__items) < self.__size:
             raise ValueError()
-        return self.__type.load(self.__items)
+        return self.__load(self.__items)
 
 
 class Object(Codec[_Serializable]):
     def __init__(self, type: Type[_Serializable], codecs: Dict[str, Codec]):
         self.__type = type
         self.__codecs = codecs
+        self.__values = tuple(codecs.values())
+        self.__dump = _dumper(type, tuple(codecs.keys()))
+        self.__load = _loader(type, tuple(codecs.keys()))
+        self.__fingerprint = None
+
+    @property
+    def type(self) -> Type[_Serializable]:
+        return self.__type
+
+    @property
+    def codecs(self) -> Dict[str, Codec]:
+        return self.__codecs
+
+    @property
+    def fingerprint(self) -> bytes:
+        if self.__fingerprint is None:
+            schema = _describe(self).encode('utf-8')
+            self.__fingerprint = hashlib.sha256(schema).digest()[:8]
+        return self.__fingerprint
+
+    def dump(self, value: _Serializable) -> tuple:
+        return self.__dump(value)
+
+    def load(self, values: Sequence) -> _Serializable:
+        return self.__load(values)
+
+    def encoder(self, value: _Serializable) -> Encoder[_Serializable]:
+        return ObjectEncoder(value, self.__type, self.__values, self.__dump)
+
+    def decoder(self) -> Decoder[_Serializable]:
+        return ObjectDecoder(self.__values, self.__load)
+
+    def _schema(self, path: tuple) -> str:
+        if self in path:
+            return f'^{len(path) - path.index(self)}'
+        path = path + (self,)
+        fields = ','.join(f'{key}:{_describe(codec, path)}' for key, codec in self.__codecs.items())
+        return f'object({fields})'
+
+
+#
+
+
+def _default(type: Type[Serializable], key: str) -> Optional[Callable[[], Any]]:
+    if dataclasses.is_dataclass(type):
+        field = type.__dataclass_fields__.get(key)
+        if field is not None:
+            if field.default is not dataclasses.MISSING:
+                return lambda: field.default
+            if field.default_factory is not dataclasses.MISSING:
+                return field.default_factory
+            return None
+
+    for base in type.__mro__:
+        if key in base.__dict__:
+            value = base.__dict__[key]
+            if inspect.isdatadescriptor(value):
+                return None
+            return lambda: value
+    return None
+
+
+class Projection(Codec[_Serializable]):
+    def __init__(self, source: Object, target: Object[_Serializable]):
+        type = target.type
+        keys = tuple(source.codecs.keys())
+        fields = tuple(target.codecs.keys())
+
+        for key in fields:
+            if key in source.codecs:
+                old = _describe(source.codecs[key])
+                new = _describe(target.codecs[key])
+                if old != new:
+                    msg = f'Cannot project field {key} of {type.__qualname__} from {old} to {new}'
+                    raise ValueError(msg)
+
+        defaults = {}
+        for key in fields:
+            if key not in source.codecs:
+                default = _default(type, key)
+                if default is None:
+                    msg = f'Cannot project onto {type.__qualname__} without a default for {key}'
+                    raise ValueError(msg)
+                defaults[key] = default
+
+        indices = {key: index for index, key in enumerate(keys)}
+        sources = tuple((key, indices.get(key)) for key in fields)
+        load = target.load
+
+        self.__type = type
+        self.__codecs = tuple(source.codecs.values())
+        self.__fingerprint = source.fingerprint
+        self.__missing = tuple(key for key in keys if key not in target.codecs)
+        self.__dump = _dumper(type, keys) if not self.__missing else None
+        self.__load = lambda values: load(tuple(
+            values[index] if index is not None else defaults[key]() for key, index in sources
+        ))
+
+    @property
+    def type(self) -> Type[_Serializable]:
+        return self.__type
+
+    @property
+    def fingerprint(self) -> bytes:
+        return self.__fingerprint
 
     def encoder(self, value: _Serializable) -> Encoder[_Serializable]:
-        return ObjectEncoder(value, self.__type, self.__codecs)
+        if self.__missing:
+            msg = f'Cannot project {self.__type.__qualname__} without {", ".join(self.__missing)}'
+            raise EncoderException(msg)
+        return ObjectEncoder(value, self.__type, self.__codecs, self.__dump)
 
     def decoder(self) -> Decoder[_Serializable]:
-        return ObjectDecoder(self.__type, self.__codecs)
+        return ObjectDecoder(self.__codecs, self.__load)
+
+
+#
+
+
+class DeltaEncoder(MultipartEncoder[_Serializable]):
+    def __init__(self, previous: Optional[_Serializable], value: _Serializable, codec: Object[_Serializable]):
+        if not isinstance(value, codec.type):
+            raise ValueError()
+        if previous is not None and not isinstance(previous, codec.type):
+            raise ValueError()
+        codecs = tuple(codec.codecs.values())
+        values = codec.dump(value)
+        previous = codec.dump(previous) if previous is not None else None
+        bitmap = bytearray((len(codecs) + 7) // 8)
+        changed = []
+        for index, field in enumerate(codecs):
+            value = values[index]
+            if previous is None or type(previous[index]) is not type(value) or previous[index] != value:
+                bitmap[index >> 3] |= 1 << (index & 7)
+                changed.append((value, field))
+        self.__bitmap = bytes(bitmap)
+        self.__values = iter(changed)
+        super().__init__()
+
+    def _next(self, current: Optional[Encoder]) -> Optional[Encoder]:
+        if current is None:
+            return RawEncoder(self.__bitmap)
+        try:
+            value, codec = next(self.__values)
+        except StopIteration:
+            return None
+        return codec.encoder(value)
+
+
+class DeltaDecoder(MultipartDecoder[_Serializable]):
+    def __init__(self, previous: Optional[_Serializable], codec: Object[_Serializable]):
+        if previous is not None and not isinstance(previous, codec.type):
+            raise ValueError()
+        self.__codec = codec
+        self.__previous = codec.dump(previous) if previous is not None else None
+        self.__keys = tuple(codec.codecs.keys())
+        self.__codecs = tuple(codec.codecs.values())
+        self.__bitmap = None
+        self.__items = []
+        super().__init__()
+
+    def _next(self, current: Optional[Decoder]) -> Optional[Decoder]:
+        if current is None:
+            size = (len(self.__codecs) + 7) // 8
+            if size:
+                return RawDecoder(size)
+            self.__bitmap = bytes()
+        elif self.__bitmap is None:
+            self.__bitmap = current.get()
+        else:
+            self.__items.append(current.get())
+
+        while len(self.__items) < len(self.__codecs):
+            index = len(self.__items)
+            if self.__bitmap[index >> 3] & (1 << (index & 7)):
+                return self.__codecs[index].decoder()
+            if self.__previous is None:
+                msg = f'Missing field {self.__keys[index]} without a previous value'
+                raise DecoderException(msg)
+            self.__items.append(self.__previous[index])
+
+        return None
+
+    def get(self) -> _Serializable:
+        if len(self.__items) < len(self.__codecs):
+            raise ValueError()
+        return self.__codec.load(self.__items)
+
+
+class Delta(Codec[typing.Tuple[Optional[_Serializable], _Serializable]]):
+    def __init__(self, codec: Object[_Serializable]):
+        self.__codec = codec
+
+    def encoder(
+            self,
+            value: typing.Tuple[Optional[_Serializable], _Serializable]
+    ) -> Encoder[typing.Tuple[Optional[_Serializable], _Serializable]]:
+        previous, value = value
+        return DeltaEncoder(previous, value, self.__codec)
+
+    def decoder(self, previous: Optional[_Serializable] = None) -> Decoder[_Serializable]:
+        return DeltaDecoder(previous, self.__codec)
@@ -36,15 +36,29 @@ class Null(Codec[None]):
     def decoder(self) -> Decoder[None]:
         return NullDecoder()
 
+    def _schema(self, path: tuple) -> str:
+        return 'null'
+
 
 #
 
 
+def _zigzag(value: int) -> int:
+    value = int(value)
+    return (value << 1) ^ (value >> 31)
+
+
+def _unzigzag(value: int) -> int:
+    signed = value & 1
+    value = value >> 1
+    if signed:
+        value = ~value
+    return value
+
+
 class IntegerEncoder(VarintEncoder[int]):
     def __init__(self, value: int):
-        value = int(value)
-        value = (value << 1) ^ (value >> 31)
-        super().__init__(value)
+        super().__init__(_zigzag(value))
 
 
 class IntegerDecoder(VarintDecoder[int]):
@@ -53,12 +67,7 @@ class IntegerDecoder(VarintDecoder[int]):
         self.__value = None
 
     def _flush(self):
-        value = super().get()
-        signed = value & 1
-        value = value >> 1
-        if signed:
-            value = ~value
-        self.__value = value
+        self.__value = _unzigzag(super().get())
 
     def get(self) -> int:
         if self.__value is None:
@@ -73,6 +82,9 @@ class Integer(Codec[int]):
     def decoder(self) -> Decoder[int]:
         return IntegerDecoder()
 
+    def _schema(self, path: tuple) -> str:
+        return 'int'
+
 
 #
 
@@ -104,6 +116,9 @@ class Float(Codec[float]):
     def decoder(self) -> Decoder[float]:
         return FloatDecoder()
 
+    def _schema(self, path: tuple) -> str:
+        return 'float'
+
 
 #
 
@@ -141,3 +156,6 @@ class Boolean(Codec[bool]):
 
     def decoder(self) -> Decoder[bool]:
         return BooleanDecoder()
+
+    def _schema(self, path: tuple) -> str:
+        return 'bool'
@@ -7,6 +7,7 @@ from lumo.types import Serializable, eval_type
 from ._collections import *
 from ._generics import *
 from ._primitives import *
+from ._schema import *
 from ._strings import *
 
 __all__ = 'Proton',
@@ -57,6 +58,11 @@ class Proton(CodecRegistry):
 
         args = get_args(descriptor)
 
+        if origin is Columnar:
+            arg, = args
+            codec = context.codec(eval_type(arg, descriptor))
+            return Columns(codec) if isinstance(codec, Object) else None
+
         if origin in (list, set):
             arg, = args
             codec = context.codec(eval_type(arg, descriptor))
@@ -65,10 +71,10 @@ class Proton(CodecRegistry):
         if origin is dict:
             key_type, value_type = args
             key_codec = context.codec(eval_type(key_type, descriptor))
-            if key_type is None:
+            if key_codec is None:
                 return None
             value_codec = context.codec(eval_type(value_type, descriptor))
-            if value_type is None:
+            if value_codec is None:
                 return None
             return Dict(key_codec, value_codec)
 
@@ -104,7 +110,8 @@ class Proton(CodecRegistry):
             descriptor: typing.Union[type, ForwardRef, str],
             context: Optional[CodecContext] = None
     ) -> Optional[Codec]:
-        if context is None:
+        root = context is None
+        if root:
             context = CodecContext(self)
 
         descriptor = eval_type(descriptor)
@@ -116,9 +123,35 @@ class Proton(CodecRegistry):
         codec = self.__resolve(descriptor, context)
         if codec is not None:
             self.__cache[descriptor] = codec
+            if root and isinstance(codec, Object):
+                # nested objects may still be incomplete until the outermost
+                # resolution returns, so the schema is only hashed here
+                codec.fingerprint
 
         return codec
 
+    def fingerprint(self, descriptor: typing.Union[type, ForwardRef, str]) -> Optional[bytes]:
+        codec = self.codec(descriptor)
+        if not isinstance(codec, Object):
+            return None
+        return codec.fingerprint
+
+    def versioned(
+            self,
+            descriptor: typing.Union[type, ForwardRef, str],
+            *previous: typing.Union[type, ForwardRef, str]
+    ) -> Optional[Versioned]:
+        codec = self.codec(descriptor)
+        if not isinstance(codec, Object):
+            return None
+        versioned = Versioned(codec)
+        for descriptor in previous:
+            codec = self.codec(descriptor)
+            if not isinstance(codec, Object):
+                raise ValueError()
+            versioned.register(codec)
+        return versioned
+
     def register(self, descriptor: type, codec: Codec):
         self.__codecs[descriptor] = codec
 
@@ -0,0 +1,83 @@
+import typing
+from typing import Optional, Type, Union
+
+from lumo.codecs import *
+from lumo.types import Serializable
+from ._basic import *
+from ._generics import Object, Projection
+
+__all__ = 'Versioned',
+
+#
+
+_FINGERPRINT_SIZE = 8
+
+_Serializable = typing.TypeVar('_Serializable', bound=Serializable)
+
+
+class VersionedEncoder(MultipartEncoder[_Serializable]):
+    def __init__(self, value: _Serializable, fingerprint: bytes, codec: Codec[_Serializable]):
+        super().__init__((RawEncoder(fingerprint), codec.encoder(value)))
+
+
+class VersionedDecoder(MultipartDecoder[_Serializable]):
+    def __init__(self, codecs: typing.Dict[bytes, Codec[_Serializable]]):
+        self.__codecs = codecs
+        self.__decoder = None
+        super().__init__()
+
+    def _next(self, current: Optional[Decoder]) -> Optional[Decoder]:
+        if current is None:
+            return RawDecoder(_FINGERPRINT_SIZE)
+
+        if self.__decoder is None:
+            fingerprint = current.get()
+            codec = self.__codecs.get(fingerprint)
+            if codec is None:
+                msg = f'Unknown schema fingerprint {fingerprint.hex()}'
+                raise DecoderException(msg)
+            decoder = codec.decoder()
+            self.__decoder = decoder
+            return decoder
+
+        return None
+
+    def get(self) -> _Serializable:
+        if self.__decoder is None:
+            raise ValueError()
+        return self.__decoder.get()
+
+
+class Versioned(Codec[_Serializable]):
+    def __init__(self, codec: Object[_Serializable]):
+        self.__codec = codec
+        self.__codecs: typing.Dict[bytes, Codec[_Serializable]] = {codec.fingerprint: codec}
+
+    @property
+    def type(self) -> Type[_Serializable]:
+        return self.__codec.type
+
+    @property
+    def fingerprint(self) -> bytes:
+        return self.__codec.fingerprint
+
+    @property
+    def fingerprints(self) -> typing.Tuple[bytes, ...]:
+        return tuple(self.__codecs)
+
+    def register(self, codec: Union[Object, Projection]):
+        if codec.fingerprint == self.__codec.fingerprint:
+            return
+        if isinstance(codec, Object) and codec.type is not self.__codec.type:
+            codec = Projection(codec, self.__codec)
+        self.__codecs[codec.fingerprint] = codec
+
+    def unregister(self, fingerprint: bytes):
+        if fingerprint != self.__codec.fingerprint:
+            self.__codecs.pop(fingerprint, None)
+
+    def encoder(self, value: _Serializable) -> Encoder[_Serializable]:
+        return VersionedEncoder(value, self.__codec.fingerprint, self.__codec)
+
+    def decoder(self) -> Decoder[_Serializable]:
+        return VersionedDecoder(self.__codecs)
@@ -0,0 +1,255 @@
+import os
+import sys
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from struct import Struct
+from typing import Any, Iterable, List, Optional
+
+from lumo.codecs import *
+from ._gather import GatherBuffer
+
+__all__ = 'SharedBatch', 'SharedRing',
+
+#
+
+_U32 = Struct('<I')
+_U64 = Struct('<Q')
+_RING = Struct('<QQQ')
+_RING_HEADER = 64
+_WRAP = 0xFFFFFFFF
+
+
+class _MemoryReader:
+    def __init__(self, view: memoryview):
+        self.__view = view
+        self.__pos = 0
+
+    def read(self, size: int = -1) -> memoryview:
+        start = self.__pos
+        end = len(self.__view) if size < 0 else min(start + size, len(self.__view))
+        self.__pos = end
+        return self.__view[start:end]
+
+    def tell(self) -> int:
+        return self.__pos
+
+
+_created = set()
+
+
+def _create(name: Optional[str], size: int) -> SharedMemory:
+    memory = SharedMemory(name=name, create=True, size=size)
+    _created.add(memory.name)
+    return memory
+
+
+def _attach(name: str) -> SharedMemory:
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    memory = SharedMemory(name=name)
+    if os.name == 'posix' and memory.name not in _created:
+        resource_tracker.unregister(memory._name, 'shared_memory')
+    return memory
+
+
+def _unlink(memory: SharedMemory):
+    memory.unlink()
+    _created.discard(memory.name)
+
+
+def _decode(codec: Codec, view: memoryview):
+    stream = _MemoryReader(view)
+    decoder = codec.decoder()
+    while decoder.has_remaining():
+        position = stream.tell()
+        decoder.decode(stream)
+        if stream.tell() == position:
+            raise DecoderException('Truncated message in shared memory')
+    if stream.tell() != len(view):
+        raise DecoderException('Trailing data in shared memory message')
+    return decoder.get()
+
+
+def _copy(buffer: GatherBuffer, view: memoryview) -> int:
+    pos = 0
+    for segment in buffer.segments():
+        size = len(segment)
+        view[pos:pos + size] = segment
+        pos += size
+    return pos
+
+
+#
+
+
+class SharedBatch:
+    def __init__(self, name: str):
+        self.__memory = _attach(name)
+        self.__load()
+
+    @classmethod
+    def create(cls, codec: Codec, values: Iterable, name: Optional[str] = None) -> 'SharedBatch':
+        buffer = GatherBuffer()
+        sizes = []
+        for value in values:
+            sizes.append(buffer.encode(codec.encoder(value)))
+
+        header = _U64.size * (len(sizes) + 2)
+        memory = _create(name, header + len(buffer))
+        try:
+            view = memory.buf
+            _U64.pack_into(view, 0, len(sizes))
+            offset = header
+            for index, size in enumerate(sizes):
+                _U64.pack_into(view, _U64.size * (index + 1), offset)
+                offset += size
+            _U64.pack_into(view, _U64.size * (len(sizes) + 1), offset)
+            _copy(buffer, view[header:offset])
+            del view
+        except Exception:
+            memory.close()
+            _unlink(memory)
+            raise
+
+        batch = cls.__new__(cls)
+        batch.__memory = memory
+        batch.__load()
+        return batch
+
+    def __load(self):
+        view = self.__memory.buf
+        count, = _U64.unpack_from(view, 0)
+        offsets = [offset for offset, in _U64.iter_unpack(view[_U64.size:_U64.size * (count + 2)])]
+        if len(offsets) != count + 1 or offsets[-1] > len(view):
+            raise DecoderException('Corrupt shared batch offset table')
+        self.__offsets = offsets
+
+    @property
+    def name(self) -> str:
+        return self.__memory.name
+
+    def view(self, index: int) -> memoryview:
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.__memory.buf[self.__offsets[index]:self.__offsets[index + 1]]
+
+    def decode(self, codec: Codec, index: int):
+        view = self.view(index)
+        try:
+            return _decode(codec, view)
+        finally:
+            view.release()
+
+    def decode_all(self, codec: Codec) -> List[Any]:
+        return [self.decode(codec, index) for index in range(len(self))]
+
+    def close(self):
+        self.__memory.close()
+
+    def unlink(self):
+        _unlink(self.__memory)
+
+    def __len__(self) -> int:
+        return len(self.__offsets) - 1
+
+    def __enter__(self) -> 'SharedBatch':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+#
+
+
+class SharedRing:
+    EMPTY = object()
+
+    def __init__(self, name: str):
+        self.__memory = _attach(name)
+        self.__capacity, _, _ = _RING.unpack_from(self.__memory.buf, 0)
+
+    @classmethod
+    def create(cls, capacity: int, name: Optional[str] = None) -> 'SharedRing':
+        if capacity <= 0:
+            raise ValueError()
+        capacity = (capacity + 7) & ~7
+        memory = _create(name, _RING_HEADER + capacity)
+        _RING.pack_into(memory.buf, 0, capacity, 0, 0)
+        ring = cls.__new__(cls)
+        ring.__memory = memory
+        ring.__capacity = capacity
+        return ring
+
+    def __positions(self):
+        _, head, tail = _RING.unpack_from(self.__memory.buf, 0)
+        return head, tail
+
+    @property
+    def name(self) -> str:
+        return self.__memory.name
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    def put(self, codec: Codec, value) -> bool:
+        buffer = GatherBuffer()
+        buffer.encode(codec.encoder(value))
+        length = len(buffer)
+        size = (_U32.size + length + 7) & ~7
+        if size > self.__capacity // 2 or length >= _WRAP:
+            raise ValueError(f'Message of {length} bytes does not fit in the ring')
+
+        head, tail = self.__positions()
+        pos = head % self.__capacity
+        skip = self.__capacity - pos if pos + size > self.__capacity else 0
+        if head + skip + size - tail > self.__capacity:
+            return False
+
+        view = self.__memory.buf
+        if skip:
+            _U32.pack_into(view, _RING_HEADER + pos, _WRAP)
+            pos = 0
+        start = _RING_HEADER + pos + _U32.size
+        _copy(buffer, view[start:start + length])
+        _U32.pack_into(view, _RING_HEADER + pos, length)
+        _U64.pack_into(view, _U64.size, head + skip + size)
+        return True
+
+    def get(self, codec: Codec):
+        head, tail = self.__positions()
+        if tail == head:
+            return SharedRing.EMPTY
+
+        view = self.__memory.buf
+        pos = tail % self.__capacity
+        length, = _U32.unpack_from(view, _RING_HEADER + pos)
+        if length == _WRAP:
+            tail += self.__capacity - pos
+            pos = 0
+            length, = _U32.unpack_from(view, _RING_HEADER)
+
+        start = _RING_HEADER + pos + _U32.size
+        message = view[start:start + length]
+        try:
+            return _decode(codec, message)
+        finally:
+            message.release()
+            _U64.pack_into(view, _U64.size * 2, tail + ((_U32.size + length + 7) & ~7))
+
+    def has_remaining(self) -> bool:
+        head, tail = self.__positions()
+        return head != tail
+
+    def close(self):
+        self.__memory.close()
+
+    def unlink(self):
+        _unlink(self.__memory)
+
+    def __enter__(self) -> 'SharedRing':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
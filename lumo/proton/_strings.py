@@ -1,9 +1,11 @@
-from typing import BinaryIO
+from collections import OrderedDict
+from typing import BinaryIO, Optional
 
 from lumo.codecs import *
 from ._basic import *
+from ._basic import _varint
 
-__all__ = 'Bytes', 'String'
+__all__ = 'Bytes', 'String', 'StringCache',
 
 
 #
@@ -48,6 +50,9 @@ class Bytes(Codec[bytes]):
     def decoder(self) -> Decoder[bytes]:
         return BytesDecoder()
 
+    def _schema(self, path: tuple) -> str:
+        return 'bytes'
+
 
 #
 
@@ -61,9 +66,85 @@ class StringDecoder(BytesDecoder):
         return super().get().decode('utf-8')
 
 
+class StringCache:
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError()
+        self.__entries: OrderedDict[str, bytes] = OrderedDict()
+        self.__capacity = capacity
+        self.__size = 0
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.__hits + self.__misses
+        return self.__hits / total if total else 0.0
+
+    def get(self, value: str) -> bytes:
+        data = self.__entries.get(value)
+        if data is not None:
+            self.__hits += 1
+            self.__entries.move_to_end(value)
+            return data
+
+        self.__misses += 1
+        data = value.encode('utf-8')
+        data = bytes(_varint(len(data)) + data)
+        if len(data) > self.__capacity:
+            return data
+
+        self.__entries[value] = data
+        self.__size += len(data)
+        while self.__size > self.__capacity:
+            _, evicted = self.__entries.popitem(last=False)
+            self.__size -= len(evicted)
+        return data
+
+    def clear(self):
+        self.__entries.clear()
+        self.__size = 0
+        self.__hits = 0
+        self.__misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self.__entries
+
+
 class String(Codec[str]):
+    def __init__(self, cache: Optional[StringCache] = None):
+        self.__cache = cache
+
+    @property
+    def cache(self) -> Optional[StringCache]:
+        return self.__cache
+
     def encoder(self, value: str) -> Encoder[str]:
+        if self.__cache is not None:
+            return RawEncoder(self.__cache.get(value))
         return StringEncoder(value)
 
     def decoder(self) -> Decoder[str]:
         return StringDecoder()
+
+    def _schema(self, path: tuple) -> str:
+        return 'str'
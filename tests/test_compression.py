@@ -0,0 +1,116 @@
+import io
+import zlib
+
+import pytest
+
+from lumo.codecs import DecoderException
+from lumo.proton import Bytes, Compressed, compressions
+
+VALUES = [b'abc' * 5000, b'q', bytes(range(256)) * 40]
+
+
+def _varint(value: int) -> bytes:
+    data = bytearray()
+    while True:
+        octet = value & 0x7F
+        value >>= 7
+        data.append(octet | 0x80 if value else octet)
+        if not value:
+            return bytes(data)
+
+
+def _block(id: int, count: int, payload: bytes) -> bytes:
+    return _varint(id) + _varint(count) + _varint(len(payload)) + payload
+
+
+def _messages(values) -> bytes:
+    return b''.join(_varint(len(value)) + value for value in values)
+
+
+class _Trickle(io.RawIOBase):
+    def __init__(self, data: bytes, size: int):
+        self.__data = data
+        self.__pos = 0
+        self.__size = size
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            size = self.__size
+        data = self.__data[self.__pos:self.__pos + min(size, self.__size)]
+        self.__pos += len(data)
+        return data
+
+
+def _encode(codec, value) -> bytes:
+    encoder = codec.encoder(value)
+    stream = io.BytesIO()
+    while encoder.has_remaining():
+        encoder.encode(stream)
+    return stream.getvalue()
+
+
+def _decode(codec, data: bytes, size: int = 1 << 30):
+    decoder = codec.decoder()
+    stream = _Trickle(data, size)
+    while decoder.has_remaining():
+        decoder.decode(stream)
+    return decoder.get()
+
+
+@pytest.mark.parametrize('compression', compressions())
+def test_roundtrip(compression):
+    codec = Compressed(Bytes(), compression)
+    assert _decode(codec, _encode(codec, VALUES)) == VALUES
+    assert _decode(codec, _encode(codec, [])) == []
+
+
+@pytest.mark.parametrize('compression', compressions())
+def test_roundtrip_byte_at_a_time(compression):
+    codec = Compressed(Bytes(), compression)
+    assert _decode(codec, _encode(codec, VALUES), 1) == VALUES
+
+
+@pytest.mark.parametrize('cut', [1, 4])
+def test_truncated_zlib(cut):
+    payload = zlib.compress(_messages(VALUES))[:-cut]
+    with pytest.raises(DecoderException):
+        _decode(Compressed(Bytes()), _block(1, len(VALUES), payload))
+
+
+@pytest.mark.parametrize('compression', [c for c in compressions() if c != 'none'])
+@pytest.mark.parametrize('cut', [1, 12])
+def test_truncated(compression, cut):
+    data = _encode(Compressed(Bytes(), compression), VALUES)
+    id, count, length = data[0], data[1], 0
+    pos = 2
+    for shift in range(0, 64, 7):
+        length |= (data[pos] & 0x7F) << shift
+        pos += 1
+        if not data[pos - 1] & 0x80:
+            break
+    payload = data[pos:pos + length]
+    with pytest.raises(DecoderException):
+        _decode(Compressed(Bytes()), _block(id, count, payload[:-cut]))
+
+
+def test_trailing_compressed_data():
+    payload = zlib.compress(_messages(VALUES)) + b'garbage'
+    with pytest.raises(DecoderException):
+        _decode(Compressed(Bytes()), _block(1, len(VALUES), payload))
+
+
+def test_trailing_compressed_data_in_separate_chunk():
+    payload = zlib.compress(_messages(VALUES)) + b'garbage'
+    with pytest.raises(DecoderException):
+        _decode(Compressed(Bytes()), _block(1, len(VALUES), payload), 1)
+
+
+def test_output_past_count():
+    payload = zlib.compress(_messages(VALUES))
+    with pytest.raises(DecoderException):
+        _decode(Compressed(Bytes()), _block(1, len(VALUES) - 1, payload))
+
+
+def test_unsupported_compression():
+    with pytest.raises(DecoderException):
+        _decode(Compressed(Bytes()), _block(99, 0, b''))
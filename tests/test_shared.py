@@ -0,0 +1,126 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from lumo.codecs import DecoderException
+from lumo.proton import Boolean, Bytes, Integer, Null, SharedBatch, SharedRing
+
+
+@pytest.fixture
+def ring():
+    ring = SharedRing.create(64)
+    yield ring
+    ring.close()
+    ring.unlink()
+
+
+def test_empty(ring):
+    assert not ring.has_remaining()
+    assert ring.get(Integer()) is SharedRing.EMPTY
+
+
+def test_none_value(ring):
+    assert ring.put(Null(), None)
+    assert ring.has_remaining()
+    assert ring.get(Null()) is None
+    assert ring.get(Null()) is SharedRing.EMPTY
+
+
+def test_wraparound(ring):
+    codec = Bytes()
+    for index in range(200):
+        value = bytes([index % 256]) * (index % 23 + 1)
+        assert ring.put(codec, value)
+        assert ring.get(codec) == value
+    assert not ring.has_remaining()
+
+
+def test_wraparound_largest_message(ring):
+    codec = Bytes()
+    value = b'x' * (ring.capacity // 2 - 5)
+    for _ in range(ring.capacity // 4):
+        assert ring.put(codec, b'y' * 3)
+        assert ring.get(codec) == b'y' * 3
+        assert ring.put(codec, value)
+        assert ring.get(codec) == value
+    assert not ring.has_remaining()
+
+
+def test_too_large(ring):
+    with pytest.raises(ValueError):
+        ring.put(Bytes(), b'x' * (ring.capacity // 2))
+
+
+def test_full_capacity(ring):
+    codec = Integer()
+    count = 0
+    while ring.put(codec, count):
+        count += 1
+    assert count == ring.capacity // 8
+    assert not ring.put(codec, count)
+
+    assert ring.get(codec) == 0
+    assert ring.put(codec, count)
+    assert not ring.put(codec, count + 1)
+
+    values = []
+    while ring.has_remaining():
+        values.append(ring.get(codec))
+    assert values == list(range(1, count + 1))
+
+
+def test_bad_record_is_skipped(ring):
+    assert ring.put(Integer(), 1)
+    assert ring.put(Integer(), 2)
+    with pytest.raises(DecoderException):
+        ring.get(Boolean())
+    assert ring.get(Integer()) == 2
+    assert not ring.has_remaining()
+
+
+def test_attach(ring):
+    other = SharedRing(ring.name)
+    try:
+        assert other.capacity == ring.capacity
+        assert ring.put(Bytes(), b'shared')
+        assert other.get(Bytes()) == b'shared'
+        assert not ring.has_remaining()
+    finally:
+        other.close()
+
+
+_CONSUMER = '''
+import sys
+from lumo.proton import Bytes, SharedBatch, SharedRing
+ring = SharedRing(sys.argv[1])
+print(ring.get(Bytes()).decode())
+ring.close()
+batch = SharedBatch(sys.argv[2])
+print(','.join(value.decode() for value in batch.decode_all(Bytes())))
+batch.close()
+'''
+
+
+def test_attach_from_other_process(ring):
+    batch = SharedBatch.create(Bytes(), [b'a', b'b'])
+    try:
+        assert ring.put(Bytes(), b'shared')
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        result = subprocess.run(
+            [sys.executable, '-c', _CONSUMER, ring.name, batch.name],
+            capture_output=True, text=True, env=env, timeout=60,
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.split() == ['shared', 'a,b']
+        assert 'leaked' not in result.stderr
+
+        other = SharedRing(ring.name)
+        other.close()
+        other = SharedBatch(batch.name)
+        other.close()
+        assert not ring.has_remaining()
+    finally:
+        batch.close()
+        batch.unlink()